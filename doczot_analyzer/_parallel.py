@@ -0,0 +1,67 @@
+"""Process pool support shared by scanner and docs_parser.
+
+Both modules parse files in a ProcessPoolExecutor only when there is enough
+work to pay for starting workers, and only when more than one CPU is
+available to run them.
+
+On platforms that start workers with spawn (Windows, macOS), each worker
+re-imports the calling script, so a script that scans in a pool must guard
+its entry point with ``if __name__ == "__main__":``.
+"""
+
+import os
+from typing import Callable, List, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def available_cpu_count() -> int:
+    """Return the number of CPUs this process is allowed to run on.
+
+    Uses the CPU affinity mask where the platform has one (Linux), so
+    containers and CI jobs pinned to a single CPU report 1 even when the
+    machine has more.
+
+    Returns:
+        Number of usable CPUs (at least 1)
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        # sched_getaffinity is not available on macOS or Windows
+        return os.cpu_count() or 1
+
+
+def should_parallelize(total_bytes: int, n_items: int, min_bytes: int) -> bool:
+    """Decide whether a batch of files is worth parsing in a process pool.
+
+    Args:
+        total_bytes: Combined size of the files to parse
+        n_items: Number of files to parse
+        min_bytes: Smallest total_bytes that pays for starting workers
+
+    Returns:
+        True if there are at least two files, total_bytes reaches
+        min_bytes and at least two CPUs are available
+    """
+    return n_items >= 2 and total_bytes >= min_bytes and available_cpu_count() >= 2
+
+
+def pool_map(func: Callable[[T], R], jobs: Sequence[T], chunksize: int) -> List[R]:
+    """Run func over jobs in a ProcessPoolExecutor, keeping job order.
+
+    Args:
+        func: Top-level function, so workers can unpickle it
+        jobs: Picklable arguments, one per call
+        chunksize: Jobs sent to a worker at a time
+
+    Returns:
+        Results in the order of jobs
+    """
+    # Imported here: concurrent.futures.process pulls in multiprocessing,
+    # which dominates import time when only small repos are scanned
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(func, jobs, chunksize=chunksize))
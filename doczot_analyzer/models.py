@@ -1,16 +1,25 @@
 """Data models for DocZot analyzer.
 
-This module defines Pydantic v2 models for representing:
+This module defines models for representing:
 - API endpoints detected in code
 - Documentation references found in markdown
 - Analysis results and reports
+
+Parameter, Endpoint and DocReference are created once per parameter /
+endpoint / doc line in the scanning hot paths, so they are slotted
+dataclasses without runtime validation. Parameter and Endpoint are also
+frozen, and Endpoint.parameters is a tuple, since the scanner caches and
+shares them between scans; use dataclasses.replace() to derive a changed
+copy. The result and report models are Pydantic v2 models.
 """
 
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple
 from pydantic import BaseModel, Field
 
 
-class Parameter(BaseModel):
+@dataclass(slots=True, frozen=True)
+class Parameter:
     """Represents a function parameter in an API endpoint.
 
     Attributes:
@@ -37,7 +46,8 @@ class Parameter(BaseModel):
         return hash((self.name, self.type_hint, self.location))
 
 
-class Endpoint(BaseModel):
+@dataclass(slots=True, frozen=True)
+class Endpoint:
     """Represents a detected FastAPI endpoint.
 
     Based on endpoint-detection.md specification R3.
@@ -50,11 +60,12 @@ class Endpoint(BaseModel):
         line_number: Line number where the endpoint is defined
         docstring: Function docstring if present
         has_docstring: Whether the function has a docstring
-        parameters: List of function parameters
+        parameters: Tuple of function parameters
         response_model: Response model type if specified in decorator
         is_deprecated: Whether endpoint is marked as deprecated
         is_async: Whether the handler function is async
-        is_documented: Whether this endpoint is found in documentation (set during analysis)
+        is_documented: Whether this endpoint is found in documentation (set during
+            analysis, with dataclasses.replace)
     """
     method: str
     path: str
@@ -63,12 +74,16 @@ class Endpoint(BaseModel):
     line_number: int
     docstring: Optional[str] = None
     has_docstring: bool = False
-    parameters: List[Parameter] = Field(default_factory=list)
+    parameters: Tuple[Parameter, ...] = ()
     response_model: Optional[str] = None
     is_deprecated: bool = False
     is_async: bool = False
     is_documented: bool = False
 
+    def __post_init__(self) -> None:
+        """Store parameters as a tuple, so a passed-in list can't be mutated."""
+        object.__setattr__(self, "parameters", tuple(self.parameters))
+
     def __str__(self) -> str:
         """String representation of endpoint."""
         deprecated = " [DEPRECATED]" if self.is_deprecated else ""
@@ -84,8 +99,14 @@ class Endpoint(BaseModel):
         """Return a unique signature for this route (method + path)."""
         return f"{self.method} {self.path}"
 
+    @property
+    def parameters_by_name(self) -> Dict[str, Parameter]:
+        """Return the parameters keyed by name (a new dict on each access)."""
+        return {param.name: param for param in self.parameters}
 
-class DocReference(BaseModel):
+
+@dataclass(slots=True)
+class DocReference:
     """Represents an API endpoint reference found in markdown documentation.
 
     Based on documentation-parsing.md specification R3.
@@ -100,10 +121,13 @@ class DocReference(BaseModel):
     """
     file_path: str
     content: str
-    mentioned_paths: List[str] = Field(default_factory=list)
-    mentioned_methods: List[str] = Field(default_factory=list)
+    mentioned_paths: List[str] = field(default_factory=list)
+    mentioned_methods: List[str] = field(default_factory=list)
     section_heading: Optional[str] = None
     line_number: int = 1
+    # Membership sets for matches_endpoint, built on first use
+    _paths_set: Optional[FrozenSet[str]] = field(default=None, init=False, repr=False, compare=False)
+    _methods_set: Optional[FrozenSet[str]] = field(default=None, init=False, repr=False, compare=False)
 
     def __str__(self) -> str:
         """String representation of documentation reference."""
@@ -119,14 +143,24 @@ class DocReference(BaseModel):
     def matches_endpoint(self, endpoint: Endpoint) -> bool:
         """Check if this documentation reference matches an endpoint.
 
+        A reference is usually checked against every endpoint, so the
+        mentioned paths and methods are turned into sets on the first call;
+        they should not be modified after matching starts.
+
         Args:
             endpoint: The endpoint to check against
 
         Returns:
             True if this doc reference mentions the endpoint's method and path
         """
-        method_match = endpoint.method in self.mentioned_methods
-        path_match = endpoint.path in self.mentioned_paths
+        paths = self._paths_set
+        methods = self._methods_set
+        if paths is None or methods is None:
+            paths = self._paths_set = frozenset(self.mentioned_paths)
+            methods = self._methods_set = frozenset(self.mentioned_methods)
+
+        method_match = endpoint.method in methods
+        path_match = endpoint.path in paths
         return method_match and path_match
 
 
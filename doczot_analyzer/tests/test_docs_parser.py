@@ -4,8 +4,10 @@ Tests are based on docs/features/documentation-parsing.md specification.
 Each test references specific requirements (R1-R4) and edge cases (EC1-EC4).
 """
 
+import os
 import pytest
 from pathlib import Path
+from doczot_analyzer import docs_parser
 from doczot_analyzer.docs_parser import (
     parse_markdown_file,
     find_markdown_files,
@@ -99,6 +101,53 @@ class TestMarkdownFileFinding:
         assert len(files) == 1
         assert "visible.md" in files[0]
 
+    def test_skips_hidden_and_translation_directories(self, tmp_path):
+        """Test R1: Skip hidden directories and translated docs."""
+        docs_dir = tmp_path / "docs"
+        (docs_dir / "zh").mkdir(parents=True)
+        (docs_dir / ".vuepress").mkdir()
+        (docs_dir / "api.md").write_text("# API")
+        (docs_dir / "zh" / "api.md").write_text("# API")
+        (docs_dir / ".vuepress" / "api.md").write_text("# API")
+
+        files = find_markdown_files(str(tmp_path))
+
+        assert files == [str(docs_dir / "api.md")]
+
+    def test_keeps_rglob_order(self, tmp_path, monkeypatch):
+        """Test files come in rglob order: a directory's files, then each subdirectory."""
+        docs_dir = tmp_path / "docs"
+        for name in ("b", "c", "a"):
+            (docs_dir / name).mkdir(parents=True)
+            (docs_dir / name / f"{name}.md").write_text("# Page")
+        (docs_dir / "r.md").write_text("# Root")
+
+        # List docs/ in a fixed order rather than the filesystem's
+        listing_order = {"b": 0, "r.md": 1, "c": 2, "a": 3}
+        real_scandir = os.scandir
+
+        class Listing(list):
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                return False
+
+        def scandir(path):
+            with real_scandir(path) as entries:
+                return Listing(sorted(entries, key=lambda e: listing_order.get(e.name, 0)))
+
+        monkeypatch.setattr(os, "scandir", scandir)
+
+        files = find_markdown_files(str(docs_dir))
+
+        assert files == [
+            str(docs_dir / "r.md"),
+            str(docs_dir / "b" / "b.md"),
+            str(docs_dir / "c" / "c.md"),
+            str(docs_dir / "a" / "a.md"),
+        ]
+
 
 class TestEndpointExtraction:
     """Test R2: Extract endpoint references from markdown."""
@@ -378,6 +427,53 @@ GET /api/public
         # Should NOT find the commented endpoint
         assert "/api/internal" not in all_paths
 
+    def test_ignores_comment_opened_after_closed_comment(self):
+        """Test EC3: a comment that closes and a new one that opens on one line.
+
+        Reference: documentation-parsing.md EC3
+        """
+        markdown_content = """## API
+
+<!-- draft --> <!--
+GET /api/internal
+-->
+
+GET /api/public
+"""
+        references = parse_markdown_file(markdown_content, "docs/api.md")
+
+        all_paths = []
+        for ref in references:
+            all_paths.extend(ref.mentioned_paths)
+
+        assert all_paths == ["/api/public"]
+        assert references[0].line_number == 7
+
+    def test_ignores_inline_comment_only(self):
+        """Test EC3: text around a single-line comment is still scanned.
+
+        Reference: documentation-parsing.md EC3
+        """
+        markdown_content = """## Users <!-- TODO: rename -->
+
+GET /api/public <!-- GET /api/internal -->
+"""
+        references = parse_markdown_file(markdown_content, "docs/api.md")
+
+        assert len(references) == 1
+        assert references[0].mentioned_paths == ["/api/public"]
+        assert references[0].section_heading == "Users"
+
+    def test_handles_method_followed_by_long_whitespace(self):
+        """Test that whitespace runs after a method don't cause backtracking."""
+        markdown_content = "GET" + " " * 50_000 + "users\n\nGET | /users\n"
+
+        references = parse_markdown_file(markdown_content, "docs/api.md")
+
+        assert len(references) == 1
+        assert references[0].mentioned_paths == ["/users"]
+        assert references[0].line_number == 3
+
     def test_handles_various_path_formats(self):
         """Test EC4: Similar path variations.
 
@@ -490,6 +586,14 @@ class TestHTTPMethods:
         assert "POST" in all_methods
         assert "DELETE" in all_methods
 
+    def test_ignores_non_ascii_method_lookalikes(self):
+        """Test methods that only match case-insensitively via non-ASCII letters."""
+        markdown_content = "## API\n\nOPT\u0130ONS /users\n"
+
+        references = parse_markdown_file(markdown_content, "docs/api.md")
+
+        assert references == []
+
 
 class TestDirectoryScanning:
     """Test scan_documentation function."""
@@ -528,12 +632,40 @@ class TestDirectoryScanning:
 
         assert "/api/v1/users" in all_paths
 
+    def test_handles_crlf_line_endings(self, tmp_path):
+        """Test scanning files with Windows line endings."""
+        docs_dir = tmp_path / "docs"
+        docs_dir.mkdir()
+
+        (docs_dir / "api.md").write_bytes(b"## Users\r\n\r\nGET /users\r\n")
+
+        references = scan_documentation(str(tmp_path))
+
+        assert len(references) == 1
+        assert references[0].content == "GET /users"
+        assert references[0].section_heading == "Users"
+        assert references[0].line_number == 3
+
     def test_returns_empty_list_for_no_docs(self, tmp_path):
         """Test scanning directory with no markdown files."""
         references = scan_documentation(str(tmp_path))
 
         assert references == []
 
+    def test_scans_files_in_parallel(self, tmp_path, monkeypatch):
+        """Test the process pool finds the same references as a sequential scan."""
+        monkeypatch.setattr(docs_parser, "should_parallelize", lambda *args: True)
+        docs_dir = tmp_path / "docs"
+        docs_dir.mkdir()
+
+        for i in range(5):
+            (docs_dir / f"page{i}.md").write_text(f"GET /items/{i}")
+
+        references = scan_documentation(str(tmp_path))
+
+        assert len(references) == 5
+        assert references == scan_documentation(str(tmp_path), parallel=False)
+
 
 class TestMatchingEndpoints:
     """Test DocReference.matches_endpoint() method."""
@@ -0,0 +1,44 @@
+"""Tests for the process pool gate shared by scanner and docs_parser."""
+
+import pytest
+
+from doczot_analyzer import _parallel
+from doczot_analyzer._parallel import available_cpu_count, pool_map, should_parallelize
+
+
+class TestShouldParallelize:
+    """Test when a batch of files is parsed in a process pool."""
+
+    def test_parallelizes_large_batches_on_several_cpus(self, monkeypatch):
+        """Test enough bytes and files on two CPUs use the pool."""
+        monkeypatch.setattr(_parallel, "available_cpu_count", lambda: 2)
+
+        assert should_parallelize(total_bytes=1000, n_items=2, min_bytes=1000)
+
+    @pytest.mark.parametrize(
+        "cpus, total_bytes, n_items",
+        [
+            (1, 1000, 10),  # a single CPU
+            (2, 999, 10),  # below min_bytes
+            (2, 1000, 1),  # one file can't be split across workers
+        ],
+    )
+    def test_stays_sequential(self, monkeypatch, cpus, total_bytes, n_items):
+        """Test one CPU, too few bytes or a single file skip the pool."""
+        monkeypatch.setattr(_parallel, "available_cpu_count", lambda: cpus)
+
+        assert not should_parallelize(total_bytes, n_items, min_bytes=1000)
+
+    def test_counts_at_least_one_cpu(self):
+        """Test the usable CPU count is never zero."""
+        assert available_cpu_count() >= 1
+
+
+class TestPoolMap:
+    """Test pool_map."""
+
+    def test_keeps_job_order(self):
+        """Test results come back in the order of the jobs."""
+        jobs = ["a" * n for n in range(10)]
+
+        assert pool_map(len, jobs, chunksize=3) == list(range(10))
@@ -4,8 +4,11 @@ Tests are based on docs/features/endpoint-detection.md specification.
 Each test references specific requirements (R1-R5) and edge cases (EC1-EC5).
 """
 
+import dataclasses
 import pytest
-from doczot_analyzer.scanner import scan_python_file
+from pathlib import Path
+from doczot_analyzer import scanner
+from doczot_analyzer.scanner import scan_python_file, scan_directory
 from doczot_analyzer.models import Endpoint, Parameter
 
 
@@ -119,16 +122,14 @@ async def delete_item(id: int): pass
 '''
         endpoints = scan_python_file(source_code, "api.py")
 
-        assert len(endpoints) == 5
-
-        methods = [ep.method for ep in endpoints]
-        assert methods == ["GET", "POST", "GET", "PUT", "DELETE"]
-
-        paths = [ep.path for ep in endpoints]
-        assert paths == ["/items", "/items", "/items/{id}", "/items/{id}", "/items/{id}"]
-
-        functions = [ep.function_name for ep in endpoints]
-        assert functions == ["list_items", "create_item", "get_item", "update_item", "delete_item"]
+        actual = tuple((ep.method, ep.path, ep.function_name) for ep in endpoints)
+        assert actual == (
+            ("GET", "/items", "list_items"),
+            ("POST", "/items", "create_item"),
+            ("GET", "/items/{id}", "get_item"),
+            ("PUT", "/items/{id}", "update_item"),
+            ("DELETE", "/items/{id}", "delete_item"),
+        )
 
     def test_detects_deprecated_flag(self):
         """Test Example 4 from specification: Deprecated endpoint.
@@ -176,11 +177,8 @@ async def create_user(): pass
 '''
         endpoints = scan_python_file(source_code, "api.py")
 
-        assert len(endpoints) == 2
-        assert endpoints[0].method == "GET"
-        assert endpoints[0].path == "/users"
-        assert endpoints[1].method == "POST"
-        assert endpoints[1].path == "/users"
+        actual = tuple((ep.method, ep.path) for ep in endpoints)
+        assert actual == (("GET", "/users"), ("POST", "/users"))
 
     def test_detects_all_http_methods_on_router(self):
         """Test all HTTP methods work with router decorators.
@@ -214,9 +212,8 @@ async def head_test(): pass
 '''
         endpoints = scan_python_file(source_code, "api.py")
 
-        assert len(endpoints) == 7
-        methods = [ep.method for ep in endpoints]
-        assert methods == ["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS", "HEAD"]
+        actual = tuple(ep.method for ep in endpoints)
+        assert actual == ("GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS", "HEAD")
 
 
 class TestEdgeCases:
@@ -265,6 +262,36 @@ def sync_endpoint():
         assert endpoint.is_async is False
         assert endpoint.function_name == "sync_endpoint"
 
+    def test_detects_endpoints_in_nested_blocks(self):
+        """Test endpoints registered inside an app factory and conditionals."""
+        source_code = '''
+from fastapi import FastAPI
+
+def create_app():
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    if settings.debug:
+        @app.get("/debug")
+        async def debug():
+            return {}
+
+    return app
+
+try:
+    import extras
+except ImportError:
+    @router.get("/fallback")
+    async def fallback():
+        return {}
+'''
+        endpoints = scan_python_file(source_code, "api.py")
+
+        assert {ep.path for ep in endpoints} == {"/health", "/debug", "/fallback"}
+
     def test_detects_multiple_path_parameters(self):
         """Test EC3: Multiple path parameters.
 
@@ -316,8 +343,9 @@ async def search(q: str = None, limit: int = 10):
         assert len(endpoint.parameters) == 2
 
         # Find parameters by name
-        q_param = next(p for p in endpoint.parameters if p.name == "q")
-        limit_param = next(p for p in endpoint.parameters if p.name == "limit")
+        params = endpoint.parameters_by_name
+        q_param = params["q"]
+        limit_param = params["limit"]
 
         # Query parameters should not be required (have defaults)
         assert q_param.required is False
@@ -328,6 +356,22 @@ async def search(q: str = None, limit: int = 10):
         assert limit_param.default_value == "10"
         assert limit_param.location == "query"
 
+    def test_aligns_defaults_with_trailing_parameters(self):
+        """Test defaults shared with positional-only parameters line up."""
+        source_code = '''
+@app.get("/items/{item_id}")
+async def get_item(token, /, item_id: int, q: str = None, limit: int = 10):
+    pass
+'''
+        endpoints = scan_python_file(source_code, "api.py")
+
+        params = endpoints[0].parameters_by_name
+
+        assert set(params) == {"item_id", "q", "limit"}
+        assert params["item_id"].required is True
+        assert params["q"].default_value == "None"
+        assert params["limit"].default_value == "10"
+
     def test_ignores_non_fastapi_decorators(self):
         """Test EC5: Invalid decorators are skipped.
 
@@ -379,12 +423,13 @@ async def get_user(user_id: int, include_posts: bool = False):
 
         assert len(endpoint.parameters) == 2
 
-        user_id_param = next(p for p in endpoint.parameters if p.name == "user_id")
+        params = endpoint.parameters_by_name
+        user_id_param = params["user_id"]
         assert user_id_param.type_hint == "int"
         assert user_id_param.required is True
         assert user_id_param.location == "path"
 
-        include_posts_param = next(p for p in endpoint.parameters if p.name == "include_posts")
+        include_posts_param = params["include_posts"]
         assert include_posts_param.type_hint == "bool"
         assert include_posts_param.required is False
         assert include_posts_param.default_value == "False"
@@ -410,10 +455,38 @@ async def get_items(
         endpoint = endpoints[0]
 
         # Should extract type hints even if complex
-        tags_param = next(p for p in endpoint.parameters if p.name == "tags")
+        tags_param = endpoint.parameters_by_name["tags"]
         assert tags_param.type_hint is not None
         assert tags_param.required is False
 
+    def test_formats_type_hints_as_source(self):
+        """Test annotations and defaults are rendered as written."""
+        source_code = '''
+@app.get("/items")
+async def get_items(
+    filters: Dict[str, List[int]],
+    sort: models.SortOrder = models.SortOrder.ASC,
+    after: datetime.date | None = None,
+    key: Annotated[str, Header()] = "",
+    hook: Callable[[int], str] = None,
+    page: Annotated[int, Query(ge=-1, alias="p")] = 1,
+    name: str = Query(None, max_length=50),
+):
+    pass
+'''
+        endpoints = scan_python_file(source_code, "api.py")
+
+        params = endpoints[0].parameters_by_name
+
+        assert params["filters"].type_hint == "Dict[str, List[int]]"
+        assert params["sort"].type_hint == "models.SortOrder"
+        assert params["sort"].default_value == "models.SortOrder.ASC"
+        assert params["after"].type_hint == "datetime.date | None"
+        assert params["key"].type_hint == "Annotated[str, Header()]"
+        assert params["hook"].type_hint == "Callable[[int], str]"
+        assert params["page"].type_hint == "Annotated[int, Query(ge=-1, alias='p')]"
+        assert params["name"].default_value == "Query(None, max_length=50)"
+
     def test_detects_pydantic_model_parameters(self):
         """Test body parameters with Pydantic models."""
         source_code = '''
@@ -582,6 +655,94 @@ class RegularClass:
 
         assert endpoints == []
 
+    def test_raises_for_invalid_source_with_route_decorators(self):
+        """Test route-like source with syntax errors still raises."""
+        source_code = '@app.get("/users")\ndef users(:\n    pass\n'
+
+        with pytest.raises(SyntaxError) as excinfo:
+            scan_python_file(source_code, "invalid.py")
+
+        assert excinfo.value.filename == "invalid.py"
+
+    def test_detects_parenthesized_decorator(self):
+        """Test the pre-parse filter keeps @(app.get(...)) decorators."""
+        source_code = '@(app.get("/users"))\ndef users():\n    pass\n'
+
+        endpoints = scan_python_file(source_code, "api.py")
+
+        assert [ep.path for ep in endpoints] == ["/users"]
+
+    def test_detects_parenthesized_app_decorator(self):
+        """Test the pre-parse filter keeps @(app).get(...) decorators."""
+        source_code = '@(app).get("/a")\ndef a():\n    pass\n'
+
+        endpoints = scan_python_file(source_code, "api.py")
+
+        assert [ep.path for ep in endpoints] == ["/a"]
+
+    def test_detects_continued_decorator(self):
+        """Test the pre-parse filter keeps decorators split with a backslash."""
+        source_code = '@app\\\n.get("/a")\ndef a():\n    pass\n'
+
+        endpoints = scan_python_file(source_code, "api.py")
+
+        assert [ep.path for ep in endpoints] == ["/a"]
+
+    def test_detects_decorator_with_comment(self):
+        """Test the pre-parse filter keeps decorators with comments inside parentheses."""
+        source_code = '@(  # note\n app\n).get("/a")\ndef a():\n    pass\n'
+
+        endpoints = scan_python_file(source_code, "api.py")
+
+        assert [ep.path for ep in endpoints] == ["/a"]
+
+    def test_detects_nfkc_equivalent_decorator(self):
+        """Test the pre-parse filter keeps identifiers that normalize to app."""
+        source_code = '@\uff41pp.get("/a")\ndef a():\n    pass\n'
+
+        endpoints = scan_python_file(source_code, "api.py")
+
+        assert [ep.path for ep in endpoints] == ["/a"]
+
+    def test_repeated_scans_return_fresh_lists(self):
+        """Test memoized results can't be changed through a returned list."""
+        source_code = '@app.get("/users")\ndef users(q: str = None):\n    pass\n'
+
+        first = scan_python_file(source_code, "api.py")
+        first.clear()
+        second = scan_python_file(source_code, "api.py")
+
+        assert [ep.path for ep in second] == ["/users"]
+        assert scan_python_file(source_code, "other.py")[0].file_path == "other.py"
+
+        # Shared endpoints are frozen, so one caller can't alter another's
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            second[0].is_documented = True
+
+        # ...and so are their parameters
+        with pytest.raises(AttributeError):
+            second[0].parameters.append(Parameter(name="evil"))
+        assert [p.name for p in scan_python_file(source_code, "api.py")[0].parameters] == ["q"]
+
+    def test_list_built_endpoint_equals_scanned(self):
+        """Test an Endpoint built with a parameters list, as in the spec, equals the scan."""
+        source_code = '@app.get("/users/{user_id}")\nasync def get_user(user_id: int):\n    pass\n'
+        params = [Parameter(name="user_id", type_hint="int", location="path", required=True)]
+
+        expected = Endpoint(
+            method="GET",
+            path="/users/{user_id}",
+            function_name="get_user",
+            file_path="api.py",
+            line_number=2,
+            parameters=params,
+            is_async=True,
+        )
+        params.append(Parameter(name="evil"))
+
+        assert scan_python_file(source_code, "api.py") == [expected]
+        assert expected.parameters == (params[0],)
+
     def test_handles_syntax_errors_gracefully(self):
         """Test that syntax errors don't crash the scanner."""
         source_code = '''
@@ -598,3 +759,87 @@ app = FastAPI(
         except SyntaxError:
             # Acceptable to raise SyntaxError for invalid Python
             pass
+
+
+class TestDirectoryScanning:
+    """Test scan_directory function."""
+
+    def test_scans_endpoint_files_and_skips_others(self, tmp_path):
+        """Test scanning a project tree with route and non-route files."""
+        (tmp_path / "app").mkdir()
+        (tmp_path / "app" / "main.py").write_text(
+            'from fastapi import FastAPI\n'
+            'app = FastAPI()\n'
+            '\n'
+            '@app.get("/users")\n'
+            'async def list_users():\n'
+            '    pass\n'
+        )
+        (tmp_path / "app" / "routes.py").write_text(
+            '@ router .post("/users")\n'
+            'async def create_user():\n'
+            '    pass\n'
+        )
+        (tmp_path / "app" / "helpers.py").write_text("def helper(:\n")
+        (tmp_path / "tests").mkdir()
+        (tmp_path / "tests" / "routes.py").write_text(
+            '@app.get("/test-only")\n'
+            'def test_only():\n'
+            '    pass\n'
+        )
+
+        endpoints = scan_directory(str(tmp_path))
+
+        assert sorted((ep.method, ep.path, ep.file_path) for ep in endpoints) == [
+            ("GET", "/users", str(Path("app") / "main.py")),
+            ("POST", "/users", str(Path("app") / "routes.py")),
+        ]
+
+    def test_skip_dirs_apply_below_scan_root_only(self, tmp_path):
+        """Test a project checked out under a skipped name is still scanned."""
+        project = tmp_path / "examples" / "shop"
+        (project / "node_modules").mkdir(parents=True)
+        (project / "main.py").write_text('@app.get("/cart")\ndef cart():\n    pass\n')
+        (project / "node_modules" / "vendored.py").write_text(
+            '@app.get("/vendored")\ndef vendored():\n    pass\n'
+        )
+        (project / "main_test.py").write_text('@app.get("/t")\ndef t():\n    pass\n')
+
+        endpoints = scan_directory(str(project))
+
+        assert [(ep.path, ep.file_path) for ep in endpoints] == [("/cart", "main.py")]
+
+    def test_scans_files_in_parallel(self, tmp_path, monkeypatch):
+        """Test endpoint files parsed in the process pool."""
+        monkeypatch.setattr(scanner, "should_parallelize", lambda *args: True)
+        # Paths unique to this test, so the scan cache can't skip the pool
+        for i in range(5):
+            (tmp_path / f"routes{i}.py").write_text(
+                f'@router.get("/pool/{i}")\n'
+                f'async def get_item_{i}(q: str = None):\n'
+                f'    pass\n'
+            )
+
+        endpoints = scan_directory(str(tmp_path))
+
+        assert sorted((ep.file_path, ep.path) for ep in endpoints) == [
+            (f"routes{i}.py", f"/pool/{i}") for i in range(5)
+        ]
+        assert all(ep.parameters[0].location == "query" for ep in endpoints)
+
+    def test_rescan_reuses_unchanged_files(self, tmp_path):
+        """Test rescanning only parses files whose content changed."""
+        (tmp_path / "users.py").write_text('@app.get("/users")\ndef users():\n    pass\n')
+        (tmp_path / "items.py").write_text('@app.get("/items")\ndef items():\n    pass\n')
+
+        first = {ep.path: ep for ep in scan_directory(str(tmp_path))}
+        (tmp_path / "items.py").write_text('@app.post("/items")\ndef items():\n    pass\n')
+        second = {ep.path: ep for ep in scan_directory(str(tmp_path))}
+
+        assert second["/users"] is first["/users"]
+        assert second["/items"].method == "POST"
+
+    def test_raises_for_missing_directory(self, tmp_path):
+        """Test that a missing directory is reported."""
+        with pytest.raises(FileNotFoundError):
+            scan_directory(str(tmp_path / "missing"))